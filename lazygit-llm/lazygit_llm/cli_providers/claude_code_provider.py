@@ -340,7 +340,7 @@ class ClaudeCodeProvider(BaseProvider):
 
         try:
             # --helpでサポートされているフラグを確認
-            help_result = subprocess.run(
+            help_result = self._run_cli(
                 [self.claude_code_path, '--help'],
                 capture_output=True,
                 text=True,
@@ -446,7 +446,7 @@ class ClaudeCodeProvider(BaseProvider):
             logger.debug(f"claude-codeコマンド実行: {' '.join(cmd_args[:3])}... (プロンプトはstdin経由)")
 
             # subprocess実行 (セキュリティ要件に準拠)
-            result = subprocess.run(
+            result = self._run_cli(
                 cmd_args,
                 input=sanitized_prompt,  # プロンプトをstdinに渡す
                 capture_output=True,
@@ -497,6 +497,21 @@ class ClaudeCodeProvider(BaseProvider):
             logger.exception("claude-codeコマンド実行中に予期しないエラー")
             raise ProviderError("claude-codeコマンド実行に失敗しました") from e
 
+    def _run_cli(self, cmd: list[str], **kwargs: Any) -> subprocess.CompletedProcess:
+        """
+        CLIコマンドを実行する薄いラッパー
+
+        subprocess呼び出しを一箇所に集約し、テストから差し替え可能にする。
+
+        Args:
+            cmd: コマンド引数リスト
+            **kwargs: subprocess.runに渡す追加引数
+
+        Returns:
+            実行結果
+        """
+        return subprocess.run(cmd, **kwargs)
+
     def _sanitize_input(self, input_text: str) -> str:
         """
         入力テキストをサニタイゼーション
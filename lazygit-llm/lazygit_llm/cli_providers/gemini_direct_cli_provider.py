@@ -8,9 +8,11 @@ Gemini CLI プロバイダー (ダイレクト gemini コマンド使用)
 import subprocess
 import logging
 import os
+import string
 import shutil
 import json
 import tempfile
+from functools import lru_cache
 from typing import Dict, Any, Optional, List, ClassVar
 from pathlib import Path
 
@@ -18,6 +20,66 @@ from lazygit_llm.base_provider import BaseProvider, ProviderError, Authenticatio
 
 logger = logging.getLogger(__name__)
 
+# stderrのエラー種別ごとのキーワード (先頭の種別ほど優先、小文字で記述)
+_STDERR_KEYWORDS: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ('quota', ('quota exceeded', 'rate limit')),
+    ('auth', ('authentication', 'api key')),
+    ('network', ('network', 'connection', 'connectivity')),
+    ('timeout', ('timeout', 'timed out')),
+)
+# 単独のトークンとして現れた場合に各種別とみなすHTTPステータスコード
+_STDERR_STATUS_CODES: Dict[str, frozenset[str]] = {
+    'quota': frozenset(('429',)),
+    'auth': frozenset(('401', '403')),
+}
+
+# エラー種別ごとに送出する例外とユーザー向けメッセージ ({stderr} はstderrの内容に置換)
+_STDERR_ERRORS: Dict[str, tuple[type, str]] = {
+    'quota': (
+        ProviderError,
+        "Gemini APIクォータ制限: 1日あたりのリクエスト制限に達しました\n"
+        "明日再試行するか、別のプロバイダー (openai、anthropic) をご利用ください",
+    ),
+    'auth': (
+        AuthenticationError,
+        "Gemini CLI認証エラー: APIキーまたは認証設定を確認してください",
+    ),
+    'network': (
+        ProviderError,
+        "ネットワーク接続エラー: {stderr}\nインターネット接続を確認してください",
+    ),
+    'timeout': (
+        ProviderTimeoutError,
+        "Gemini APIタイムアウト: {stderr}\n設定ファイルでtimeout値を増やしてください",
+    ),
+}
+
+
+@lru_cache(maxsize=64)
+def _classify_stderr_text(stderr: str) -> Optional[str]:
+    """
+    stderrの内容からエラー種別を判定 (同一出力の再判定はキャッシュから返す)
+
+    stderrは最大でMAX_STDERR_SIZEまで保持されるため、キャッシュサイズは小さく抑えている。
+
+    Args:
+        stderr: コマンドの標準エラー出力 (空でないこと)
+
+    Returns:
+        'quota' / 'auth' / 'network' / 'timeout' のいずれか。該当しない場合はNone
+    """
+    # キーワードはすべて固定文字列のため、正規表現ではなく部分文字列検索で判定する
+    text = stderr.lower()
+    # ステータスコードは前後の記号を除いたトークン集合との共通部分で判定する
+    tokens = {token.strip(string.punctuation) for token in text.split()}
+    for category, keywords in _STDERR_KEYWORDS:
+        codes = _STDERR_STATUS_CODES.get(category)
+        if codes and not codes.isdisjoint(tokens):
+            return category
+        if any(keyword in text for keyword in keywords):
+            return category
+    return None
+
 
 class GeminiDirectCLIProvider(BaseProvider):
     """
@@ -117,14 +179,10 @@ class GeminiDirectCLIProvider(BaseProvider):
             logger.exception("Geminiコマンド実行エラー: returncode=%s, stderr=%s", e.returncode, stderr_output)
 
             # エラーの種類に応じた詳細なメッセージ
-            if "quota exceeded" in stderr_output.lower() or "429" in stderr_output or "rate limit" in stderr_output.lower():
-                raise ProviderError("Gemini APIクォータ制限: 1日あたりのリクエスト制限に達しました\n明日再試行するか、別のプロバイダー (openai、anthropic) をご利用ください") from e
-            elif "authentication" in stderr_output.lower() or "api key" in stderr_output.lower():
-                raise AuthenticationError("Gemini CLI認証エラー: APIキーまたは認証設定を確認してください") from e
-            elif "network" in stderr_output.lower() or "connection" in stderr_output.lower() or "connectivity" in stderr_output.lower():
-                raise ProviderError(f"ネットワーク接続エラー: {stderr_output}\nインターネット接続を確認してください") from e
-            elif "timeout" in stderr_output.lower() or "timed out" in stderr_output.lower():
-                raise ProviderTimeoutError(f"Gemini APIタイムアウト: {stderr_output}\n設定ファイルでtimeout値を増やしてください") from e
+            category = self._classify_stderr(stderr_output, e.returncode)
+            if category is not None:
+                error_class, template = _STDERR_ERRORS[category]
+                raise error_class(template.format(stderr=stderr_output)) from e
             elif e.returncode == 1:
                 raise AuthenticationError("Gemini CLI認証エラー: 認証情報を確認してください") from e
             else:
@@ -134,6 +192,23 @@ class GeminiDirectCLIProvider(BaseProvider):
             logger.exception("Gemini CLI実行中に予期しないエラー")
             raise ProviderError(f"Gemini CLI予期しないエラー: {e}") from e
 
+    def _classify_stderr(self, stderr: str, returncode: Optional[int] = None) -> Optional[str]:
+        """
+        geminiコマンドのstderrからエラー種別を判定
+
+        Args:
+            stderr: コマンドの標準エラー出力
+            returncode: コマンドの終了コード (0の場合は成功とみなし判定しない)
+
+        Returns:
+            'quota' / 'auth' / 'network' / 'timeout' のいずれか。該当しない場合はNone
+        """
+        # 成功時や出力がない場合はパターン走査を行わない
+        if returncode == 0 or not stderr:
+            return None
+
+        return _classify_stderr_text(stderr)
+
     def _verify_gemini_binary(self) -> str:
         """
         geminiバイナリのパスを検証
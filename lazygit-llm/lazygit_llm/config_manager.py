@@ -7,16 +7,92 @@ YAML設定ファイルの読み込み、検証、環境変数展開を行う。
 
 import os
 import re
+import copy
 import yaml
 import logging
-from typing import Dict, Any, Optional, Union
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Any, Callable, Optional, Union
 from pathlib import Path
+from types import MappingProxyType
 from dataclasses import dataclass, field
 
 from .security_validator import SecurityValidator
 
 logger = logging.getLogger(__name__)
 
+# libyamlが利用可能であればC実装のローダーを使用(安全性はSafeLoaderと同等)
+_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# サポートされているプロバイダーの定義
+_SUPPORTED_PROVIDERS_DATA: Dict[str, Dict[str, Any]] = {
+    'openai': {'type': 'api', 'required_fields': ['api_key', 'model_name']},
+    'anthropic': {'type': 'api', 'required_fields': ['api_key', 'model_name']},
+    'gemini': {'type': 'api', 'required_fields': ['api_key', 'model_name']},
+    'gcloud': {'type': 'cli', 'required_fields': ['model_name']},
+    'gemini-cli': {'type': 'cli', 'required_fields': ['model_name']},
+    'claude-code': {'type': 'cli', 'required_fields': ['model_name']},
+    'gemini-native': {'type': 'cli', 'required_fields': ['model_name']},
+}
+# 全インスタンスで共有する読み取り専用ビュー(入れ子の辞書・リストも変更不可にする)
+_SUPPORTED_PROVIDERS = MappingProxyType({
+    name: MappingProxyType({**info, 'required_fields': tuple(info['required_fields'])})
+    for name, info in _SUPPORTED_PROVIDERS_DATA.items()
+})
+
+# ${VAR} または ${VAR:default} 形式の環境変数参照
+_ENV_RE = re.compile(r'\${([^}:]+)(?::([^}]*))?}')
+
+
+def _make_env_expander() -> Callable[[re.Match], str]:
+    """
+    _ENV_RE.sub用の置換関数を生成する
+
+    同じ変数が設定内で繰り返し参照されても os.environ の参照は一度で済むよう、
+    生成した関数ごとに参照結果をメモ化する。設定の読み込み1回につき1つ生成すること。
+
+    Returns:
+        マッチを環境変数の値(未設定時はデフォルト値または元の文字列)に置換する関数
+    """
+    env = os.environ
+    resolved: Dict[str, Optional[str]] = {}
+
+    def expand(m: re.Match) -> str:
+        key = m.group(1)
+        if key in resolved:
+            value = resolved[key]
+        else:
+            value = resolved[key] = env.get(key)
+        if value is not None:
+            return value
+        default = m.group(2)
+        return default if default is not None else m.group(0)
+
+    return expand
+
+
+@lru_cache(maxsize=64)
+def _parse_yaml_cached(path: str, mtime_ns: int, size: int) -> Any:
+    """
+    YAMLファイルを解析し、結果をキャッシュする
+
+    キーに更新時刻とサイズを含めるため、ファイルが変更されると自動的に再解析される。
+    書き換えでは通常、更新時刻かサイズの少なくとも一方が変わるため、内容を読まずに
+    変更を検出できる。ただし、ファイルシステムのタイムスタンプ精度内で同じサイズの
+    内容に書き換えられた場合は変更を検出できず、古い設定が返る点に注意。
+    返り値は共有されるため、呼び出し側でコピーしてから使用すること。
+
+    Args:
+        path: 設定ファイルの絶対パス
+        mtime_ns: ファイルの更新時刻(ナノ秒)
+        size: ファイルサイズ
+
+    Returns:
+        解析されたYAMLデータ
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_LOADER)
+
 
 @dataclass
 class ProviderConfig:
@@ -90,16 +166,8 @@ class ConfigManager:
         self._config_path: Optional[str] = None
         self.security_validator = SecurityValidator()
 
-        # サポートされているプロバイダーの定義
-        self.supported_providers = {
-            'openai': {'type': 'api', 'required_fields': ['api_key', 'model_name']},
-            'anthropic': {'type': 'api', 'required_fields': ['api_key', 'model_name']},
-            'gemini': {'type': 'api', 'required_fields': ['api_key', 'model_name']},
-            'gcloud': {'type': 'cli', 'required_fields': ['model_name']},
-            'gemini-cli': {'type': 'cli', 'required_fields': ['model_name']},
-            'claude-code': {'type': 'cli', 'required_fields': ['model_name']},
-            'gemini-native': {'type': 'cli', 'required_fields': ['model_name']},
-        }
+        # サポートされているプロバイダーの定義(全インスタンスで共有する読み取り専用ビュー)
+        self.supported_providers = _SUPPORTED_PROVIDERS
 
     def load_config(self, config_path: str) -> Dict[str, Any]:
         """
@@ -131,8 +199,12 @@ class ConfigManager:
             raise ConfigError(f"セキュリティエラー: {permission_result.message}")
 
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                raw_config = yaml.safe_load(f)
+            stat_info = config_file.stat()
+            # キャッシュ済みの解析結果は共有オブジェクト。変更はせず、
+            # 環境変数展開で作られるコピーを設定として保持する
+            raw_config = _parse_yaml_cached(
+                str(config_file.resolve()), stat_info.st_mtime_ns, stat_info.st_size
+            )
 
             # ルートは辞書である必要がある(空ファイルなどは {} とみなす)
             if raw_config is None:
@@ -334,7 +406,10 @@ class ConfigManager:
 
     def _expand_environment_variables(self, config: Any) -> Any:
         """
-        設定内の環境変数を再帰的に展開する
+        設定内の環境変数を展開する
+
+        入力は変更せず、コピーに対して dict/list を幅優先で走査しながら
+        文字列値をその場で置換する(再帰やノードごとのコンテナ再生成を行わない)。
 
         Args:
             config: 設定の一部 (dict, list, strなど)
@@ -342,24 +417,34 @@ class ConfigManager:
         Returns:
             環境変数が展開された設定
         """
-        if isinstance(config, dict):
-            return {
-                key: self._expand_environment_variables(value)
-                for key, value in config.items()
-            }
-        elif isinstance(config, list):
-            return [self._expand_environment_variables(item) for item in config]
-        elif isinstance(config, str):
+        expand = _make_env_expander()
+
+        if isinstance(config, str):
             # ${VAR} または ${VAR:default} を文字列中の任意位置で展開
-            pattern = re.compile(r'\${([^}:]+)(?::([^}]*))?}')
-            def repl(m: re.Match) -> str:
-                key = m.group(1)
-                default = m.group(2)
-                return os.environ.get(key, default if default is not None else m.group(0))
-            return pattern.sub(repl, config)
-        else:
+            return _ENV_RE.sub(expand, config)
+        if not isinstance(config, (dict, list)):
             return config
 
+        result = copy.deepcopy(config)
+        pending = deque([result])
+        # YAMLのアンカー/エイリアスで共有されたノード(deepcopy後も共有が保たれる)を
+        # 二重に展開しないよう、訪問済みのコンテナはidで記録して一度だけ処理する
+        seen = set()
+        while pending:
+            node = pending.popleft()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            items = node.items() if isinstance(node, dict) else enumerate(node)
+            for key, value in items:
+                if isinstance(value, str):
+                    # キーは変えず値のみ置換するため、走査中の更新でも安全
+                    node[key] = _ENV_RE.sub(expand, value)
+                elif isinstance(value, (dict, list)):
+                    pending.append(value)
+
+        return result
+
     def _check_file_permissions(self, config_file: Path) -> None:
         """
         設定ファイルの権限をチェック(セキュリティ要件)
@@ -394,9 +479,9 @@ class ConfigManager:
         サポートされているプロバイダーの一覧を取得
 
         Returns:
-            プロバイダー情報の辞書
+            プロバイダー情報の辞書(呼び出し側で変更しても共有定義に影響しない複製)
         """
-        return self.supported_providers.copy()
+        return copy.deepcopy(_SUPPORTED_PROVIDERS_DATA)
 
     def __str__(self) -> str:
         """設定の文字列表現(APIキーを除く)"""
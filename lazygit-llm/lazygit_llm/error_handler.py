@@ -10,7 +10,7 @@ import logging
 import re
 import sys
 import traceback
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Type, Union
 from enum import Enum
 from dataclasses import dataclass
 
@@ -19,6 +19,12 @@ from .config_manager import ConfigError
 
 logger = logging.getLogger(__name__)
 
+# Python 3.10以降ではErrorInfoを__slots__付きで生成し、インスタンスごとの__dict__を省く
+_DATACLASS_SLOTS: Dict[str, Any] = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# 例外型 -> 担当ハンドラーメソッド名のメモ(型のみで決まる判定のため全インスタンスで共有)
+_HANDLER_NAME_CACHE: Dict[Type[BaseException], Optional[str]] = {}
+
 
 class ErrorCategory(Enum):
     """エラーカテゴリ"""
@@ -40,7 +46,7 @@ class ErrorSeverity(Enum):
     LOW = "low"           # 警告
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ErrorInfo:
     """エラー情報の構造化"""
     category: ErrorCategory
@@ -432,19 +438,43 @@ class ErrorHandler:
             分類されたエラー情報
         """
         # 特定のエラータイプの処理
-        if isinstance(error, ConfigError):
-            return self.handle_config_error(error)
-        elif isinstance(error, (ProviderError, AuthenticationError, TimeoutError, ProviderTimeoutError, ResponseError)):
-            return self.handle_provider_error(error)
-        elif isinstance(error, (ImportError, PermissionError)):
-            return self.handle_system_error(error)
+        handler_name = self._handler_name_for_type(type(error))
+        if handler_name is not None:
+            return getattr(self, handler_name)(error)
+
+        # メッセージとコンテキスト双方を用いてGit関連を検出
+        blob = f"{error_message} {context or ''}".lower()
+        if "git" in blob:
+            return self.handle_git_error(error)
         else:
-            # メッセージとコンテキスト双方を用いてGit関連を検出
-            blob = f"{error_message} {context or ''}".lower()
-            if "git" in blob:
-                return self.handle_git_error(error)
-            else:
-                return self.handle_system_error(error)
+            return self.handle_system_error(error)
+
+    @staticmethod
+    def _handler_name_for_type(error_type: Type[BaseException]) -> Optional[str]:
+        """
+        例外型から担当するハンドラーメソッド名を求める
+
+        型のみで決まる判定のため、例外型ごとにメモ化する。
+
+        Args:
+            error_type: 例外の型
+
+        Returns:
+            ハンドラーメソッド名（メッセージ内容による判定が必要な場合はNone）
+        """
+        if error_type in _HANDLER_NAME_CACHE:
+            return _HANDLER_NAME_CACHE[error_type]
+
+        handler_name: Optional[str] = None
+        if issubclass(error_type, ConfigError):
+            handler_name = 'handle_config_error'
+        elif issubclass(error_type, (ProviderError, AuthenticationError, TimeoutError, ProviderTimeoutError, ResponseError)):
+            handler_name = 'handle_provider_error'
+        elif issubclass(error_type, (ImportError, PermissionError)):
+            handler_name = 'handle_system_error'
+
+        _HANDLER_NAME_CACHE[error_type] = handler_name
+        return handler_name
 
     def _get_auth_suggestions(self, error_message: str) -> List[str]:
         """認証エラー用の提案を生成"""
@@ -4,10 +4,13 @@ pytest設定ファイルと共通フィクスチャ
 テスト実行時の設定とテスト間で共有するフィクスチャを定義。
 """
 
+import importlib.util
 import pytest
 import tempfile
 import yaml
 import os
+import sys
+import types
 from pathlib import Path
 from unittest.mock import Mock, patch
 from typing import Dict, Any
@@ -40,9 +43,67 @@ SAMPLE_CONFIG = {
 }
 
 
-@pytest.fixture
+def _install_anthropic_stub():
+    """
+    Anthropic SDKが未インストールの場合に軽量スタブをsys.modulesに登録
+
+    テストではSDK呼び出しを全てモックするため、SDKがなくてもテストを
+    収集・実行できるようにする。実SDKがあればそちらを優先し、他のテストが
+    スタブを掴まないようにする。例外クラスは実SDKと同じ継承関係を持たせ、
+    プロバイダー側の例外振り分けを維持する。
+    """
+    if 'anthropic' in sys.modules or importlib.util.find_spec('anthropic') is not None:
+        return
+
+    stub = types.ModuleType('anthropic')
+
+    class APIError(Exception):
+        def __init__(self, message='', request=None, body=None, **kwargs):
+            super().__init__(message)
+            self.message = message
+            self.request = request
+            self.body = body
+
+    class APIStatusError(APIError):
+        def __init__(self, message='', response=None, body=None, **kwargs):
+            super().__init__(message, body=body)
+            self.response = response
+
+    class APIConnectionError(APIError):
+        def __init__(self, message='Connection error.', request=None, **kwargs):
+            super().__init__(message, request=request)
+
+    class APITimeoutError(APIConnectionError):
+        def __init__(self, request=None, **kwargs):
+            super().__init__('Request timed out.', request=request)
+
+    class AuthenticationError(APIStatusError):
+        pass
+
+    class RateLimitError(APIStatusError):
+        pass
+
+    class BadRequestError(APIStatusError):
+        pass
+
+    class Anthropic:
+        def __init__(self, api_key=None, **kwargs):
+            self.api_key = api_key
+
+    for obj in (APIError, APIStatusError, APIConnectionError, APITimeoutError,
+                AuthenticationError, RateLimitError, BadRequestError, Anthropic):
+        setattr(stub, obj.__name__, obj)
+
+    sys.modules['anthropic'] = stub
+
+
+# テストモジュールがプロバイダーをインポートする前にスタブを登録(SDK未インストール時のみ)
+_install_anthropic_stub()
+
+
+@pytest.fixture(scope="session")
 def sample_git_diff():
-    """サンプルGit差分データ"""
+    """サンプルGit差分データ（不変の文字列なのでセッションで共有）"""
     return SAMPLE_GIT_DIFF
 
 
@@ -52,9 +113,9 @@ def sample_config():
     return SAMPLE_CONFIG.copy()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def temp_config_file():
-    """一時的な設定ファイルを作成"""
+    """一時的な設定ファイルを作成（読み取り専用としてモジュール内で共有）"""
     with tempfile.NamedTemporaryFile(mode='w', suffix='.yml', delete=False) as f:
         yaml.dump(SAMPLE_CONFIG, f)
         f.flush()
@@ -4,442 +4,367 @@ AnthropicProviderのユニットテスト
 Anthropic Claude APIを使用したコミットメッセージ生成機能をテスト。
 """
 
+import copy
+import re
+from types import SimpleNamespace
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 import anthropic
 
-from lazygit_llm.src.api_providers.anthropic_provider import AnthropicProvider
 from lazygit_llm.src.base_provider import ProviderError, AuthenticationError, TimeoutError, ResponseError
 
 
+# テスト全体で共有する基本設定（読み取り専用として扱う）
+_BASE_CONFIG = {
+    'api_key': 'sk-ant-REDACTED',  # gitleaks:allow - test only
+    'model_name': 'claude-3-5-sonnet-20241022',
+    'timeout': 30,
+    'max_tokens': 100,
+    'prompt_template': 'Generate commit message: {diff}',
+    'additional_params': {
+        'temperature': 0.3,
+        'top_p': 0.9
+    }
+}
+
+
+# pytest.raisesで使用するメッセージパターン（モジュール読み込み時に一度だけコンパイル）
+_M_NO_API_KEY = re.compile("APIキーが設定されていません")
+_M_NO_MODEL = re.compile("モデル名が設定されていません")
+_M_UNAVAILABLE = re.compile("Anthropicライブラリがインストールされていません")
+_M_EMPTY_DIFF = re.compile("空の差分データです")
+_M_AUTH = re.compile("Anthropic API認証エラー")
+_M_RATE = re.compile("Anthropic APIレート制限エラー")
+_M_TIMEOUT = re.compile("Anthropic APIタイムアウト")
+_M_API = re.compile("Anthropic APIエラー")
+_M_UNEXPECTED = re.compile("予期しないエラー")
+_M_EMPTY_RESPONSE = re.compile("Anthropicから空のレスポンス")
+_M_INVALID_RESPONSE = re.compile("Anthropicから無効なレスポンス形式")
+_M_MAX_RETRIES = re.compile("最大リトライ回数")
+
+
+@pytest.fixture(scope="session")
+def AnthropicProvider():
+    """テスト対象クラスを遅延インポート（選択実行時の収集コストを削減）"""
+    from lazygit_llm.src.api_providers.anthropic_provider import AnthropicProvider as _P
+    return _P
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _no_sleep():
+    """リトライ待機をモジュール全体でスキップ"""
+    with patch('time.sleep'):
+        yield
+
+
+# 例外マッピングテスト用のケース表: (送出する例外を作る関数, 期待する例外型, メッセージパターン)
+# 共有インスタンスを再送出すると__traceback__や__cause__が前のテストから連鎖するため、テストごとに生成する
+_ERROR_CASES = [
+    pytest.param(
+        lambda: anthropic.AuthenticationError(message="Invalid API key", response=Mock(), body=None),
+        AuthenticationError, _M_AUTH, id="authentication",
+    ),
+    pytest.param(
+        lambda: anthropic.RateLimitError(message="Rate limit exceeded", response=Mock(), body=None),
+        ResponseError, _M_RATE, id="rate_limit",
+    ),
+    pytest.param(lambda: anthropic.APITimeoutError(request=Mock()), TimeoutError, _M_TIMEOUT, id="timeout"),
+    pytest.param(
+        lambda: anthropic.APIError(message="API Error", request=Mock(), body=None),
+        ResponseError, _M_API, id="api_error",
+    ),
+    pytest.param(lambda: Exception("Unexpected error"), ProviderError, _M_UNEXPECTED, id="unexpected"),
+    pytest.param(
+        lambda: anthropic.BadRequestError(message="Invalid request", response=Mock(), body=None),
+        ResponseError, _M_API, id="bad_request",
+    ),
+]
+
+
+def _make_response(text: str) -> SimpleNamespace:
+    """指定テキストを持つレスポンスを毎回新しく構築して返す"""
+    return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
 class TestAnthropicProvider:
     """AnthropicProviderのテストクラス"""
 
-    def setup_method(self):
-        """各テストメソッドの前に実行"""
-        self.config = {
-            'api_key': 'sk-ant-REDACTED',  # gitleaks:allow - test only
-            'model_name': 'claude-3-5-sonnet-20241022',
-            'timeout': 30,
-            'max_tokens': 100,
-            'prompt_template': 'Generate commit message: {diff}',
-            'additional_params': {
-                'temperature': 0.3,
-                'top_p': 0.9
-            }
-        }
-
-    def test_initialization_success(self):
+    @pytest.fixture(scope="class")
+    def _anthropic_patcher(self):
+        """anthropic.Anthropicのパッチをクラス全体で一度だけ適用"""
+        patcher = patch('anthropic.Anthropic')
+        yield patcher.start()
+        patcher.stop()
+
+    @pytest.fixture(autouse=True)
+    def mock_anthropic_class(self, _anthropic_patcher):
+        """テスト間でモックの状態を持ち越さないようリセットして返す"""
+        _anthropic_patcher.reset_mock(return_value=True, side_effect=True)
+        return _anthropic_patcher
+
+    @pytest.fixture
+    def config(self):
+        """テストごとに独立した基本設定のコピー"""
+        return copy.deepcopy(_BASE_CONFIG)
+
+    @pytest.fixture(scope="class")
+    def _provider_template(self, AnthropicProvider, _anthropic_patcher):
+        """クラス内で共有するプロバイダーの雛形（一度だけ構築）"""
+        return AnthropicProvider(_BASE_CONFIG)
+
+    @pytest.fixture
+    def provider(self, _provider_template):
+        """雛形を複製し、テストごとに新しいクライアントモックを割り当てたプロバイダー"""
+        p = copy.copy(_provider_template)
+        p.client = Mock()
+        return p
+
+    @pytest.fixture
+    def provider_factory(self, AnthropicProvider):
+        """基本設定を上書きしてプロバイダーを構築するファクトリ"""
+        return lambda **overrides: AnthropicProvider({**_BASE_CONFIG, **overrides})
+
+    def test_initialization_success(self, AnthropicProvider, mock_anthropic_class, config):
         """正常初期化テスト"""
-        with patch('anthropic.Anthropic') as mock_anthropic_class:
-            mock_client = Mock()
-            mock_anthropic_class.return_value = mock_client
+        mock_client = Mock()
+        mock_anthropic_class.return_value = mock_client
 
-            provider = AnthropicProvider(self.config)
+        provider = AnthropicProvider(config)
 
-            assert provider.api_key == self.config['api_key']
-            assert provider.model_name == 'claude-3-5-sonnet-20241022'
-            assert provider.timeout == 30
-            assert provider.max_tokens == 100
-            assert provider.client == mock_client
-            mock_anthropic_class.assert_called_once_with(api_key=self.config['api_key'])
+        assert provider.api_key == config['api_key']
+        assert provider.model_name == 'claude-3-5-sonnet-20241022'
+        assert provider.timeout == 30
+        assert provider.max_tokens == 100
+        assert provider.client == mock_client
+        mock_anthropic_class.assert_called_once_with(api_key=config['api_key'])
 
-    def test_initialization_missing_api_key(self):
+    def test_initialization_missing_api_key(self, AnthropicProvider, config):
         """APIキー不足時の初期化エラーテスト"""
-        config_without_key = self.config.copy()
-        del config_without_key['api_key']
+        config_without_key = {k: v for k, v in config.items() if k != 'api_key'}
 
-        with pytest.raises(ProviderError, match="APIキーが設定されていません"):
+        with pytest.raises(ProviderError, match=_M_NO_API_KEY):
             AnthropicProvider(config_without_key)
 
-    def test_initialization_missing_model(self):
+    def test_initialization_missing_model(self, AnthropicProvider, config):
         """モデル名不足時の初期化エラーテスト"""
-        config_without_model = self.config.copy()
-        del config_without_model['model_name']
+        config_without_model = {k: v for k, v in config.items() if k != 'model_name'}
 
-        with pytest.raises(ProviderError, match="モデル名が設定されていません"):
+        with pytest.raises(ProviderError, match=_M_NO_MODEL):
             AnthropicProvider(config_without_model)
 
-    def test_initialization_anthropic_unavailable(self):
+    def test_initialization_anthropic_unavailable(self, AnthropicProvider, config):
         """Anthropicライブラリ不可用時のテスト"""
         with patch('lazygit_llm.src.api_providers.anthropic_provider.ANTHROPIC_AVAILABLE', False):
-            with pytest.raises(ProviderError, match="Anthropicライブラリがインストールされていません"):
-                AnthropicProvider(self.config)
+            with pytest.raises(ProviderError, match=_M_UNAVAILABLE):
+                AnthropicProvider(config)
 
-    def test_generate_commit_message_success(self, sample_git_diff):
+    def test_generate_commit_message_success(self, provider, sample_git_diff):
         """コミットメッセージ生成成功テスト"""
-        with patch('anthropic.Anthropic') as mock_anthropic_class:
-            # モックの設定
-            mock_client = Mock()
-            mock_response = Mock()
-            mock_response.content = [Mock()]
-            mock_response.content[0].text = "feat: add new feature"
-
-            mock_client.messages.create.return_value = mock_response
-            mock_anthropic_class.return_value = mock_client
-
-            provider = AnthropicProvider(self.config)
-            result = provider.generate_commit_message(sample_git_diff)
-
-            assert result == "feat: add new feature"
-
-            # API呼び出しの確認
-            mock_client.messages.create.assert_called_once()
-            call_args = mock_client.messages.create.call_args
-            assert call_args[1]['model'] == 'claude-3-5-sonnet-20241022'
-            assert call_args[1]['max_tokens'] == 100
-            assert call_args[1]['temperature'] == 0.3
-            assert call_args[1]['top_p'] == 0.9
-
-    def test_generate_commit_message_empty_diff(self):
-        """空の差分でのエラーテスト"""
-        with patch('anthropic.Anthropic'):
-            provider = AnthropicProvider(self.config)
-
-            with pytest.raises(ProviderError, match="空の差分データです"):
-                provider.generate_commit_message("")
-
-    def test_generate_commit_message_authentication_error(self, sample_git_diff):
-        """認証エラーテスト"""
-        with patch('anthropic.Anthropic') as mock_anthropic_class:
-            mock_client = Mock()
-            mock_client.messages.create.side_effect = anthropic.AuthenticationError(
-                message="Invalid API key",
-                response=Mock(),
-                body=None
-            )
-            mock_anthropic_class.return_value = mock_client
-
-            provider = AnthropicProvider(self.config)
-
-            with pytest.raises(AuthenticationError, match="Anthropic API認証エラー"):
-                provider.generate_commit_message(sample_git_diff)
-
-    def test_generate_commit_message_rate_limit_error(self, sample_git_diff):
-        """レート制限エラーテスト"""
-        with patch('anthropic.Anthropic') as mock_anthropic_class:
-            mock_client = Mock()
-            mock_client.messages.create.side_effect = anthropic.RateLimitError(
-                message="Rate limit exceeded",
-                response=Mock(),
-                body=None
-            )
-            mock_anthropic_class.return_value = mock_client
-
-            provider = AnthropicProvider(self.config)
-
-            with pytest.raises(ResponseError, match="Anthropic APIレート制限エラー"):
-                provider.generate_commit_message(sample_git_diff)
-
-    def test_generate_commit_message_timeout_error(self, sample_git_diff):
-        """タイムアウトエラーテスト"""
-        with patch('anthropic.Anthropic') as mock_anthropic_class:
-            mock_client = Mock()
-            mock_client.messages.create.side_effect = anthropic.APITimeoutError(
-                request=Mock()
-            )
-            mock_anthropic_class.return_value = mock_client
-
-            provider = AnthropicProvider(self.config)
-
-            with pytest.raises(TimeoutError, match="Anthropic APIタイムアウト"):
-                provider.generate_commit_message(sample_git_diff)
-
-    def test_generate_commit_message_api_error(self, sample_git_diff):
-        """一般的なAPIエラーテスト"""
-        with patch('anthropic.Anthropic') as mock_anthropic_class:
-            mock_client = Mock()
-            mock_client.messages.create.side_effect = anthropic.APIError(
-                message="API Error",
-                request=Mock(),
-                body=None
-            )
-            mock_anthropic_class.return_value = mock_client
-
-            provider = AnthropicProvider(self.config)
-
-            with pytest.raises(ResponseError, match="Anthropic APIエラー"):
-                provider.generate_commit_message(sample_git_diff)
-
-    def test_generate_commit_message_unexpected_error(self, sample_git_diff):
-        """予期しないエラーテスト"""
-        with patch('anthropic.Anthropic') as mock_anthropic_class:
-            mock_client = Mock()
-            mock_client.messages.create.side_effect = Exception("Unexpected error")
-            mock_anthropic_class.return_value = mock_client
-
-            provider = AnthropicProvider(self.config)
-
-            with pytest.raises(ProviderError, match="予期しないエラー"):
-                provider.generate_commit_message(sample_git_diff)
-
-    def test_generate_commit_message_empty_response(self, sample_git_diff):
-        """空のレスポンステスト"""
-        with patch('anthropic.Anthropic') as mock_anthropic_class:
-            mock_client = Mock()
-            mock_response = Mock()
-            mock_response.content = [Mock()]
-            mock_response.content[0].text = ""
+        # モックの設定
+        mock_response = _make_response("feat: add new feature")
 
-            mock_client.messages.create.return_value = mock_response
-            mock_anthropic_class.return_value = mock_client
+        provider.client.messages.create.return_value = mock_response
 
-            provider = AnthropicProvider(self.config)
+        result = provider.generate_commit_message(sample_git_diff)
 
-            with pytest.raises(ResponseError, match="Anthropicから空のレスポンス"):
-                provider.generate_commit_message(sample_git_diff)
+        assert result == "feat: add new feature"
 
-    def test_generate_commit_message_no_content(self, sample_git_diff):
-        """コンテンツなしのレスポンステスト"""
-        with patch('anthropic.Anthropic') as mock_anthropic_class:
-            mock_client = Mock()
-            mock_response = Mock()
-            mock_response.content = []
+        # API呼び出しの確認
+        provider.client.messages.create.assert_called_once()
+        call_args = provider.client.messages.create.call_args
+        assert call_args[1]['model'] == 'claude-3-5-sonnet-20241022'
+        assert call_args[1]['max_tokens'] == 100
+        assert call_args[1]['temperature'] == 0.3
+        assert call_args[1]['top_p'] == 0.9
 
-            mock_client.messages.create.return_value = mock_response
-            mock_anthropic_class.return_value = mock_client
+    def test_generate_commit_message_empty_diff(self, provider):
+        """空の差分でのエラーテスト"""
+        with pytest.raises(ProviderError, match=_M_EMPTY_DIFF):
+            provider.generate_commit_message("")
 
-            provider = AnthropicProvider(self.config)
+    @pytest.mark.parametrize("make_exc,expected,match", _ERROR_CASES)
+    def test_error_mapping(self, provider, sample_git_diff, make_exc, expected, match):
+        """API例外がプロバイダー例外へ正しく変換されることを確認"""
+        provider.client.messages.create.side_effect = make_exc()
 
-            with pytest.raises(ResponseError, match="Anthropicから無効なレスポンス形式"):
-                provider.generate_commit_message(sample_git_diff)
+        with pytest.raises(expected, match=match):
+            provider.generate_commit_message(sample_git_diff)
 
-    def test_build_prompt(self, sample_git_diff):
-        """プロンプト構築テスト"""
-        with patch('anthropic.Anthropic'):
-            provider = AnthropicProvider(self.config)
-            prompt = provider._build_prompt(sample_git_diff)
+    def test_generate_commit_message_empty_response(self, provider, sample_git_diff):
+        """空のレスポンステスト"""
+        mock_response = _make_response("")
 
-            assert sample_git_diff in prompt
-            assert "Generate commit message:" in prompt
+        provider.client.messages.create.return_value = mock_response
 
-    def test_build_prompt_custom_template(self, sample_git_diff):
-        """カスタムプロンプトテンプレートテスト"""
-        custom_config = self.config.copy()
-        custom_config['prompt_template'] = "Custom template: {diff}\nGenerate a message."
+        with pytest.raises(ResponseError, match=_M_EMPTY_RESPONSE):
+            provider.generate_commit_message(sample_git_diff)
 
-        with patch('anthropic.Anthropic'):
-            provider = AnthropicProvider(custom_config)
-            prompt = provider._build_prompt(sample_git_diff)
+    def test_generate_commit_message_no_content(self, provider, sample_git_diff):
+        """コンテンツなしのレスポンステスト"""
+        mock_response = Mock()
+        mock_response.content = []
 
-            assert "Custom template:" in prompt
-            assert sample_git_diff in prompt
-            assert "Generate a message." in prompt
+        provider.client.messages.create.return_value = mock_response
 
-    def test_extract_response_content_success(self):
-        """レスポンス内容抽出成功テスト"""
-        with patch('anthropic.Anthropic'):
-            provider = AnthropicProvider(self.config)
+        with pytest.raises(ResponseError, match=_M_INVALID_RESPONSE):
+            provider.generate_commit_message(sample_git_diff)
 
-            mock_response = Mock()
-            mock_response.content = [Mock()]
-            mock_response.content[0].text = "fix: resolve issue"
+    @pytest.mark.parametrize("template,expected", [
+        ("Generate commit message: {diff}", ["Generate commit message:"]),
+        ("Custom template: {diff}\nGenerate a message.", ["Custom template:", "Generate a message."]),
+    ], ids=["default", "custom"])
+    def test_build_prompt(self, provider_factory, sample_git_diff, template, expected):
+        """プロンプトとメッセージ構造の構築テスト"""
+        provider = provider_factory(prompt_template=template)
+
+        prompt = provider._build_prompt(sample_git_diff)
+        assert sample_git_diff in prompt
+        for fragment in expected:
+            assert fragment in prompt
+
+        messages = provider._build_messages(sample_git_diff)
+        assert len(messages) == 1
+        assert messages[0]['role'] == 'user'
+        assert 'content' in messages[0]
+        assert sample_git_diff in messages[0]['content']
+
+    def test_extract_response_content_success(self, provider):
+        """レスポンス内容抽出成功テスト"""
+        mock_response = _make_response("fix: resolve issue")
 
-            result = provider._extract_response_content(mock_response)
-            assert result == "fix: resolve issue"
+        result = provider._extract_response_content(mock_response)
+        assert result == "fix: resolve issue"
 
-    def test_test_connection_success(self):
+    def test_test_connection_success(self, provider):
         """接続テスト成功"""
-        with patch('anthropic.Anthropic') as mock_anthropic_class:
-            mock_client = Mock()
-            mock_response = Mock()
-            mock_response.content = [Mock()]
-            mock_response.content[0].text = "test response"
+        provider.client.messages.create.return_value = _make_response("test response")
 
-            mock_client.messages.create.return_value = mock_response
-            mock_anthropic_class.return_value = mock_client
+        assert provider.test_connection() is True
 
-            provider = AnthropicProvider(self.config)
-            result = provider.test_connection()
-
-            assert result is True
-
-    def test_test_connection_failure(self):
+    def test_test_connection_failure(self, provider):
         """接続テスト失敗"""
-        with patch('anthropic.Anthropic') as mock_anthropic_class:
-            mock_client = Mock()
-            mock_client.messages.create.side_effect = anthropic.AuthenticationError(
-                message="Invalid API key",
-                response=Mock(),
-                body=None
-            )
-            mock_anthropic_class.return_value = mock_client
-
-            provider = AnthropicProvider(self.config)
-            result = provider.test_connection()
+        provider.client.messages.create.side_effect = anthropic.AuthenticationError(
+            message="Invalid API key", response=Mock(), body=None
+        )
 
-            assert result is False
+        assert provider.test_connection() is False
 
-    def test_supports_streaming(self):
+    def test_supports_streaming(self, provider):
         """ストリーミング対応確認テスト"""
-        with patch('anthropic.Anthropic'):
-            provider = AnthropicProvider(self.config)
-            assert provider.supports_streaming() is True
+        assert provider.supports_streaming() is True
 
-    def test_generate_with_streaming(self, sample_git_diff):
+    def test_generate_with_streaming(self, AnthropicProvider, mock_anthropic_class, config, sample_git_diff):
         """ストリーミング対応生成テスト"""
-        with patch('anthropic.Anthropic') as mock_anthropic_class:
-            # ストリーミングレスポンスのモック
-            mock_client = Mock()
-            mock_stream = [
-                Mock(event='content_block_delta', delta=Mock(text="feat:")),
-                Mock(event='content_block_delta', delta=Mock(text=" add")),
-                Mock(event='content_block_delta', delta=Mock(text=" feature")),
-                Mock(event='message_stop'),
-            ]
-
-            mock_client.messages.create.return_value = mock_stream
-            mock_anthropic_class.return_value = mock_client
-
-            # ストリーミング有効の設定
-            streaming_config = self.config.copy()
-            streaming_config['additional_params']['stream'] = True
+        # ストリーミングレスポンスのモック
+        mock_client = Mock()
+        mock_stream = [
+            SimpleNamespace(event='content_block_delta', delta=SimpleNamespace(text=t))
+            for t in ("feat:", " add", " feature")
+        ] + [SimpleNamespace(event='message_stop', delta=None)]
+
+        mock_client.messages.create.return_value = mock_stream
+        mock_anthropic_class.return_value = mock_client
+
+        # ストリーミング有効の設定
+        streaming_config = {
+            **config,
+            'additional_params': {**config['additional_params'], 'stream': True}
+        }
 
-            provider = AnthropicProvider(streaming_config)
-            result = provider.generate_commit_message(sample_git_diff)
+        provider = AnthropicProvider(streaming_config)
+        result = provider.generate_commit_message(sample_git_diff)
 
-            assert result == "feat: add feature"
+        assert result == "feat: add feature"
 
-            # ストリーミングが有効になっていることを確認
-            call_args = mock_client.messages.create.call_args
-            assert call_args[1]['stream'] is True
+        # ストリーミングが有効になっていることを確認
+        call_args = mock_client.messages.create.call_args
+        assert call_args[1]['stream'] is True
 
-    def test_retry_logic(self, sample_git_diff):
+    def test_retry_logic(self, provider, sample_git_diff):
         """リトライロジックテスト"""
-        with patch('anthropic.Anthropic') as mock_anthropic_class:
-            mock_client = Mock()
+        # 最初の2回は失敗、3回目は成功
+        mock_response = _make_response("feat: add retry logic")
 
-            # 最初の2回は失敗、3回目は成功
-            mock_response = Mock()
-            mock_response.content = [Mock()]
-            mock_response.content[0].text = "feat: add retry logic"
+        provider.client.messages.create.side_effect = [
+            anthropic.RateLimitError(message="Rate limit exceeded", response=Mock(), body=None),
+            anthropic.APIError(message="API Error", request=Mock(), body=None),
+            mock_response
+        ]
 
-            mock_client.messages.create.side_effect = [
-                anthropic.RateLimitError(message="Rate limit", response=Mock(), body=None),
-                anthropic.APIError(message="Temporary error", request=Mock(), body=None),
-                mock_response
-            ]
-            mock_anthropic_class.return_value = mock_client
+        result = provider.generate_commit_message(sample_git_diff)
 
-            provider = AnthropicProvider(self.config)
+        assert result == "feat: add retry logic"
+        assert provider.client.messages.create.call_count == 3
 
-            with patch('time.sleep'):  # リトライ待機をスキップ
-                result = provider.generate_commit_message(sample_git_diff)
+    def test_max_retries_exceeded(self, provider, sample_git_diff):
+        """最大リトライ回数超過テスト"""
+        # リトライごとに新しい例外を送出する
+        provider.client.messages.create.side_effect = [
+            anthropic.RateLimitError(message="Rate limit exceeded", response=Mock(), body=None)
+            for _ in range(provider.max_retries)
+        ]
 
-            assert result == "feat: add retry logic"
-            assert mock_client.messages.create.call_count == 3
+        with pytest.raises(ResponseError, match=_M_MAX_RETRIES):
+            provider.generate_commit_message(sample_git_diff)
 
-    def test_max_retries_exceeded(self, sample_git_diff):
-        """最大リトライ回数超過テスト"""
-        with patch('anthropic.Anthropic') as mock_anthropic_class:
-            mock_client = Mock()
-            mock_client.messages.create.side_effect = anthropic.RateLimitError(
-                message="Rate limit",
-                response=Mock(),
-                body=None
-            )
-            mock_anthropic_class.return_value = mock_client
-
-            provider = AnthropicProvider(self.config)
-
-            with patch('time.sleep'):  # リトライ待機をスキップ
-                with pytest.raises(ResponseError, match="最大リトライ回数"):
-                    provider.generate_commit_message(sample_git_diff)
-
-    @pytest.mark.parametrize("model_name,expected_max_tokens", [
-        ("claude-3-5-sonnet-20241022", 100),
-        ("claude-3-haiku-20240307", 100),
-        ("claude-3-opus-20240229", 100),
+    @pytest.mark.parametrize("model_name", [
+        "claude-3-5-sonnet-20241022",
+        "claude-3-haiku-20240307",
+        "claude-3-opus-20240229",
     ])
-    def test_different_models(self, model_name, expected_max_tokens):
+    def test_different_models(self, AnthropicProvider, mock_anthropic_class, config, model_name):
         """異なるモデルでの動作テスト"""
-        config = self.config.copy()
         config['model_name'] = model_name
 
-        with patch('anthropic.Anthropic') as mock_anthropic_class:
-            mock_client = Mock()
-            mock_anthropic_class.return_value = mock_client
+        provider = AnthropicProvider(config)
+        assert provider.model_name == model_name
 
-            provider = AnthropicProvider(config)
-
-            assert provider.model_name == model_name
-
-    def test_additional_params_application(self, sample_git_diff):
+    def test_additional_params_application(self, AnthropicProvider, mock_anthropic_class, config, sample_git_diff):
         """追加パラメータの適用テスト"""
-        config_with_params = self.config.copy()
-        config_with_params['additional_params'] = {
-            'temperature': 0.5,
-            'top_p': 0.8,
-            'top_k': 40,
-            'stream': False
+        config_with_params = {
+            **config,
+            'additional_params': {
+                'temperature': 0.5,
+                'top_p': 0.8,
+                'top_k': 40,
+                'stream': False
+            }
         }
 
-        with patch('anthropic.Anthropic') as mock_anthropic_class:
-            mock_client = Mock()
-            mock_response = Mock()
-            mock_response.content = [Mock()]
-            mock_response.content[0].text = "test: commit message"
+        mock_client = Mock()
+        mock_response = _make_response("test: commit message")
 
-            mock_client.messages.create.return_value = mock_response
-            mock_anthropic_class.return_value = mock_client
+        mock_client.messages.create.return_value = mock_response
+        mock_anthropic_class.return_value = mock_client
 
-            provider = AnthropicProvider(config_with_params)
-            provider.generate_commit_message(sample_git_diff)
+        provider = AnthropicProvider(config_with_params)
+        provider.generate_commit_message(sample_git_diff)
+
+        # パラメータが正しく適用されていることを確認
+        call_args = mock_client.messages.create.call_args
+        assert call_args[1]['temperature'] == 0.5
+        assert call_args[1]['top_p'] == 0.8
+        assert call_args[1]['top_k'] == 40
+        assert call_args[1]['stream'] is False
 
-            # パラメータが正しく適用されていることを確認
-            call_args = mock_client.messages.create.call_args
-            assert call_args[1]['temperature'] == 0.5
-            assert call_args[1]['top_p'] == 0.8
-            assert call_args[1]['top_k'] == 40
-            assert call_args[1]['stream'] is False
-
-    def test_build_messages_structure(self, sample_git_diff):
-        """メッセージ構造構築テスト"""
-        with patch('anthropic.Anthropic'):
-            provider = AnthropicProvider(self.config)
-            messages = provider._build_messages(sample_git_diff)
-
-            assert len(messages) == 1
-            assert messages[0]['role'] == 'user'
-            assert 'content' in messages[0]
-            assert sample_git_diff in messages[0]['content']
-
-    def test_anthropic_specific_error_handling(self, sample_git_diff):
-        """Anthropic固有のエラーハンドリングテスト"""
-        with patch('anthropic.Anthropic') as mock_anthropic_class:
-            mock_client = Mock()
-
-            # Anthropic固有のエラー
-            mock_client.messages.create.side_effect = anthropic.BadRequestError(
-                message="Invalid request",
-                response=Mock(),
-                body=None
-            )
-            mock_anthropic_class.return_value = mock_client
-
-            provider = AnthropicProvider(self.config)
-
-            with pytest.raises(ResponseError, match="Anthropic APIエラー"):
-                provider.generate_commit_message(sample_git_diff)
-
-    def test_system_message_handling(self, sample_git_diff):
+    def test_system_message_handling(self, AnthropicProvider, mock_anthropic_class, config, sample_git_diff):
         """システムメッセージの処理テスト"""
-        config_with_system = self.config.copy()
-        config_with_system['system_message'] = "You are a helpful assistant for git commits."
+        config_with_system = {
+            **config,
+            'system_message': "You are a helpful assistant for git commits."
+        }
 
-        with patch('anthropic.Anthropic') as mock_anthropic_class:
-            mock_client = Mock()
-            mock_response = Mock()
-            mock_response.content = [Mock()]
-            mock_response.content[0].text = "feat: add system message support"
+        mock_client = Mock()
+        mock_response = _make_response("feat: add system message support")
 
-            mock_client.messages.create.return_value = mock_response
-            mock_anthropic_class.return_value = mock_client
+        mock_client.messages.create.return_value = mock_response
+        mock_anthropic_class.return_value = mock_client
 
-            provider = AnthropicProvider(config_with_system)
-            provider.generate_commit_message(sample_git_diff)
+        provider = AnthropicProvider(config_with_system)
+        provider.generate_commit_message(sample_git_diff)
 
-            # システムメッセージが適用されていることを確認
-            call_args = mock_client.messages.create.call_args
-            assert 'system' in call_args[1]
-            assert call_args[1]['system'] == "You are a helpful assistant for git commits."
+        # システムメッセージが適用されていることを確認
+        call_args = mock_client.messages.create.call_args
+        assert 'system' in call_args[1]
+        assert call_args[1]['system'] == "You are a helpful assistant for git commits."
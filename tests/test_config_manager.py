@@ -4,15 +4,35 @@ ConfigManagerのユニットテスト
 設定ファイルの読み込み、環境変数解決、設定検証機能をテスト。
 """
 
-import pytest
 import os
+import pytest
 import yaml
-import tempfile
+from collections import namedtuple
 from unittest.mock import patch, mock_open
 from pathlib import Path
 
 from lazygit_llm.src.config_manager import ConfigManager, ConfigError, ProviderConfig
 
+# SecurityValidatorの検証結果の代用（テストが参照する属性のみ）
+PermResult = namedtuple("PermResult", "level message recommendations", defaults=("", ()))
+ApiKeyResult = namedtuple("ApiKeyResult", "is_valid level message recommendations", defaults=("info", "", ()))
+_PERM_OK = PermResult(level='info')
+
+# temp_config_fileを読み込んだ結果と同等の設定（YAML解析自体を検証しないテストで使用）
+_PARSED_CONFIG = {
+    'provider': 'openai',
+    'api_key': 'test-api-key',
+    'model_name': 'gpt-3.5-turbo',
+    'timeout': 30,
+    'max_tokens': 100,
+    'prompt_template': 'Generate commit message for: {diff}',
+    'additional_params': {
+        'temperature': 0.3,
+        'top_p': 0.9
+    }
+}
+_FAKE_CONFIG_PATH = '/fake/config.yml'
+
 
 class TestConfigManager:
     """ConfigManagerのテストクラス"""
@@ -21,6 +41,17 @@ class TestConfigManager:
         """各テストメソッドの前に実行"""
         self.config_manager = ConfigManager()
 
+    def _use_parsed_config(self):
+        """load_config済みの状態を再現（YAML解析を経由しない）"""
+        self.config_manager.config = dict(_PARSED_CONFIG)
+        self.config_manager._config_path = _FAKE_CONFIG_PATH
+
+    @pytest.fixture(autouse=True)
+    def _default_perm_ok(self, monkeypatch):
+        """ファイル権限チェックを既定で合格させる（警告・危険のテストは個別に上書き）"""
+        monkeypatch.setattr(self.config_manager.security_validator, 'check_file_permissions',
+                            lambda *a, **k: _PERM_OK)
+
     def test_initialization(self):
         """初期化テスト"""
         assert self.config_manager.config == {}
@@ -41,15 +72,12 @@ class TestConfigManager:
 
     def test_load_config_success(self, temp_config_file):
         """設定ファイル読み込み成功テスト"""
-        with patch.object(self.config_manager.security_validator, 'check_file_permissions') as mock_check:
-            mock_check.return_value = type('Result', (), {'level': 'info'})()
+        config = self.config_manager.load_config(temp_config_file)
 
-            config = self.config_manager.load_config(temp_config_file)
-
-            assert config['provider'] == 'openai'
-            assert config['api_key'] == 'test-api-key'
-            assert config['model_name'] == 'gpt-3.5-turbo'
-            assert self.config_manager._config_path == temp_config_file
+        assert config['provider'] == 'openai'
+        assert config['api_key'] == 'test-api-key'
+        assert config['model_name'] == 'gpt-3.5-turbo'
+        assert self.config_manager._config_path == temp_config_file
 
     def test_load_config_file_not_found(self):
         """存在しないファイルのテスト"""
@@ -58,52 +86,72 @@ class TestConfigManager:
 
     def test_load_config_malformed_yaml(self, temp_malformed_yaml_file):
         """不正なYAMLファイルのテスト"""
-        with patch.object(self.config_manager.security_validator, 'check_file_permissions') as mock_check:
-            mock_check.return_value = type('Result', (), {'level': 'info'})()
-
-            with pytest.raises(ConfigError, match="YAML解析エラー"):
-                self.config_manager.load_config(temp_malformed_yaml_file)
+        with pytest.raises(ConfigError, match="YAML解析エラー"):
+            self.config_manager.load_config(temp_malformed_yaml_file)
 
-    def test_load_config_empty_file(self):
+    def test_load_config_empty_file(self, tmp_path):
         """空のファイルのテスト"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yml', delete=False) as f:
-            f.write("")
-            f.flush()
-
-        try:
-            with patch.object(self.config_manager.security_validator, 'check_file_permissions') as mock_check:
-                mock_check.return_value = type('Result', (), {'level': 'info'})()
-
-                with pytest.raises(ConfigError, match="設定ファイルが空です"):
-                    self.config_manager.load_config(f.name)
-        finally:
-            os.unlink(f.name)
-
-    def test_load_config_permission_warning(self, temp_config_file):
+        empty_file = tmp_path / "empty.yml"
+        empty_file.write_text("")
+
+        with pytest.raises(ConfigError, match="設定ファイルが空です"):
+            self.config_manager.load_config(str(empty_file))
+
+    def test_load_config_cache_invalidated_on_rewrite(self, tmp_path, monkeypatch):
+        """設定ファイルを書き換えると解析キャッシュが無効化されることのテスト"""
+        monkeypatch.setattr(self.config_manager.security_validator, 'validate_api_key',
+                            lambda *a, **k: ApiKeyResult(is_valid=True))
+        config_file = tmp_path / "config.yml"
+        config_file.write_text(yaml.dump(_PARSED_CONFIG))
+        assert self.config_manager.load_config(str(config_file))['model_name'] == 'gpt-3.5-turbo'
+
+        # サイズが変わる書き換え
+        config_file.write_text(yaml.dump(dict(_PARSED_CONFIG, model_name='gpt-4o')))
+        assert self.config_manager.load_config(str(config_file))['model_name'] == 'gpt-4o'
+
+        # サイズが同じでも更新時刻が変われば再解析される
+        stat_info = config_file.stat()
+        config_file.write_text(yaml.dump(dict(_PARSED_CONFIG, model_name='gpt-4x')))
+        os.utime(config_file, ns=(stat_info.st_atime_ns, stat_info.st_mtime_ns + 1_000_000_000))
+        assert self.config_manager.load_config(str(config_file))['model_name'] == 'gpt-4x'
+
+    def test_load_config_cache_not_mutated_by_caller(self, tmp_path, monkeypatch):
+        """読み込んだ設定を変更してもキャッシュ済みの解析結果に影響しないことのテスト"""
+        monkeypatch.setattr(self.config_manager.security_validator, 'validate_api_key',
+                            lambda *a, **k: ApiKeyResult(is_valid=True))
+        config_file = tmp_path / "config.yml"
+        config_file.write_text(yaml.dump(_PARSED_CONFIG))
+
+        config = self.config_manager.load_config(str(config_file))
+        config['model_name'] = 'modified'
+        config['additional_params']['temperature'] = 1.0
+
+        reloaded = self.config_manager.load_config(str(config_file))
+        assert reloaded['model_name'] == 'gpt-3.5-turbo'
+        assert reloaded['additional_params']['temperature'] == 0.3
+
+    def test_load_config_permission_warning(self, temp_config_file, monkeypatch):
         """ファイル権限警告のテスト"""
-        with patch.object(self.config_manager.security_validator, 'check_file_permissions') as mock_check:
-            mock_result = type('Result', (), {
-                'level': 'warning',
-                'message': 'ファイル権限が緩い',
-                'recommendations': ['chmod 600 を推奨']
-            })()
-            mock_check.return_value = mock_result
-
-            # 警告レベルなら処理は継続される
-            config = self.config_manager.load_config(temp_config_file)
-            assert config['provider'] == 'openai'
-
-    def test_load_config_permission_danger(self, temp_config_file):
+        result = PermResult(
+            level='warning',
+            message='ファイル権限が緩い',
+            recommendations=['chmod 600 を推奨']
+        )
+        monkeypatch.setattr(self.config_manager.security_validator, 'check_file_permissions',
+                            lambda *a, **k: result)
+
+        # 警告レベルなら処理は継続される
+        config = self.config_manager.load_config(temp_config_file)
+        assert config['provider'] == 'openai'
+
+    def test_load_config_permission_danger(self, temp_config_file, monkeypatch):
         """ファイル権限危険レベルのテスト"""
-        with patch.object(self.config_manager.security_validator, 'check_file_permissions') as mock_check:
-            mock_result = type('Result', (), {
-                'level': 'danger',
-                'message': 'ファイル権限が危険'
-            })()
-            mock_check.return_value = mock_result
+        result = PermResult(level='danger', message='ファイル権限が危険')
+        monkeypatch.setattr(self.config_manager.security_validator, 'check_file_permissions',
+                            lambda *a, **k: result)
 
-            with pytest.raises(ConfigError, match="セキュリティエラー"):
-                self.config_manager.load_config(temp_config_file)
+        with pytest.raises(ConfigError, match="セキュリティエラー"):
+            self.config_manager.load_config(temp_config_file)
 
     def test_environment_variable_resolution(self, monkeypatch):
         """環境変数解決テスト"""
@@ -134,20 +182,24 @@ class TestConfigManager:
         # 解決できない場合は元の値を保持
         assert resolved['api_key'] == '${NON_EXISTENT_VAR}'
 
-    def test_get_api_key_from_config(self, temp_config_file):
-        """設定ファイルからのAPIキー取得テスト"""
-        with patch.object(self.config_manager.security_validator, 'check_file_permissions') as mock_check, \
-             patch.object(self.config_manager.security_validator, 'validate_api_key') as mock_validate:
+    def test_environment_variable_alias_expanded_once(self, monkeypatch):
+        """YAMLアンカー/エイリアスで共有された値が二重に展開されないことのテスト"""
+        # 展開結果がさらに別の環境変数参照になっている場合
+        monkeypatch.setenv("FOO2", "${FOO_KEY}")
+        monkeypatch.setenv("FOO_KEY", "secret")
+        config = yaml.safe_load("a: &x ['${FOO2}']\nb: *x\n")
 
-            mock_check.return_value = type('Result', (), {'level': 'info'})()
-            mock_validate.return_value = type('Result', (), {
-                'is_valid': True,
-                'level': 'info',
-                'message': 'Valid key',
-                'recommendations': []
-            })()
+        expanded = self.config_manager._expand_environment_variables(config)
 
-            self.config_manager.load_config(temp_config_file)
+        assert expanded['a'] == ['${FOO_KEY}']
+        assert expanded['b'] == ['${FOO_KEY}']
+
+    def test_get_api_key_from_config(self):
+        """設定ファイルからのAPIキー取得テスト"""
+        with patch.object(self.config_manager.security_validator, 'validate_api_key') as mock_validate:
+            mock_validate.return_value = ApiKeyResult(is_valid=True, message='Valid key')
+
+            self._use_parsed_config()
             api_key = self.config_manager.get_api_key('openai')
 
             assert api_key == 'test-api-key'
@@ -160,12 +212,7 @@ class TestConfigManager:
         self.config_manager.config = {'provider': 'openai'}
 
         with patch.object(self.config_manager.security_validator, 'validate_api_key') as mock_validate:
-            mock_validate.return_value = type('Result', (), {
-                'is_valid': True,
-                'level': 'info',
-                'message': 'Valid key',
-                'recommendations': []
-            })()
+            mock_validate.return_value = ApiKeyResult(is_valid=True, message='Valid key')
 
             api_key = self.config_manager.get_api_key('openai')
             assert api_key == 'env-api-key'
@@ -177,31 +224,22 @@ class TestConfigManager:
         with pytest.raises(ConfigError, match="APIキーが見つかりません"):
             self.config_manager.get_api_key('openai')
 
-    def test_get_api_key_invalid(self, temp_config_file):
+    def test_get_api_key_invalid(self):
         """無効なAPIキーのテスト"""
-        with patch.object(self.config_manager.security_validator, 'check_file_permissions') as mock_check, \
-             patch.object(self.config_manager.security_validator, 'validate_api_key') as mock_validate:
-
-            mock_check.return_value = type('Result', (), {'level': 'info'})()
-            mock_validate.return_value = type('Result', (), {
-                'is_valid': False,
-                'message': 'Invalid API key format'
-            })()
+        with patch.object(self.config_manager.security_validator, 'validate_api_key') as mock_validate:
+            mock_validate.return_value = ApiKeyResult(is_valid=False, message='Invalid API key format')
 
-            self.config_manager.load_config(temp_config_file)
+            self._use_parsed_config()
 
             with pytest.raises(ConfigError, match="APIキー検証エラー"):
                 self.config_manager.get_api_key('openai')
 
-    def test_get_model_name_success(self, temp_config_file):
+    def test_get_model_name_success(self):
         """モデル名取得成功テスト"""
-        with patch.object(self.config_manager.security_validator, 'check_file_permissions') as mock_check:
-            mock_check.return_value = type('Result', (), {'level': 'info'})()
+        self._use_parsed_config()
+        model_name = self.config_manager.get_model_name('openai')
 
-            self.config_manager.load_config(temp_config_file)
-            model_name = self.config_manager.get_model_name('openai')
-
-            assert model_name == 'gpt-3.5-turbo'
+        assert model_name == 'gpt-3.5-turbo'
 
     def test_get_model_name_not_found(self):
         """モデル名が設定されていない場合のテスト"""
@@ -210,16 +248,13 @@ class TestConfigManager:
         with pytest.raises(ConfigError, match="モデル名が設定されていません"):
             self.config_manager.get_model_name('openai')
 
-    def test_get_prompt_template_from_config(self, temp_config_file):
+    def test_get_prompt_template_from_config(self):
         """設定からのプロンプトテンプレート取得テスト"""
-        with patch.object(self.config_manager.security_validator, 'check_file_permissions') as mock_check:
-            mock_check.return_value = type('Result', (), {'level': 'info'})()
-
-            self.config_manager.load_config(temp_config_file)
-            template = self.config_manager.get_prompt_template()
+        self._use_parsed_config()
+        template = self.config_manager.get_prompt_template()
 
-            assert template == 'Generate commit message for: {diff}'
-            assert '{diff}' in template
+        assert template == 'Generate commit message for: {diff}'
+        assert '{diff}' in template
 
     def test_get_prompt_template_default(self):
         """デフォルトプロンプトテンプレート取得テスト"""
@@ -239,20 +274,12 @@ class TestConfigManager:
         with pytest.raises(ConfigError, match="プロンプトテンプレートに{diff}プレースホルダーが含まれていません"):
             self.config_manager.get_prompt_template()
 
-    def test_get_provider_config_api_provider(self, temp_config_file):
+    def test_get_provider_config_api_provider(self):
         """APIプロバイダー設定取得テスト"""
-        with patch.object(self.config_manager.security_validator, 'check_file_permissions') as mock_check, \
-             patch.object(self.config_manager.security_validator, 'validate_api_key') as mock_validate:
-
-            mock_check.return_value = type('Result', (), {'level': 'info'})()
-            mock_validate.return_value = type('Result', (), {
-                'is_valid': True,
-                'level': 'info',
-                'message': 'Valid key',
-                'recommendations': []
-            })()
+        with patch.object(self.config_manager.security_validator, 'validate_api_key') as mock_validate:
+            mock_validate.return_value = ApiKeyResult(is_valid=True, message='Valid key')
 
-            self.config_manager.load_config(temp_config_file)
+            self._use_parsed_config()
             provider_config = self.config_manager.get_provider_config()
 
             assert provider_config.name == 'openai'
@@ -296,15 +323,12 @@ class TestConfigManager:
         with pytest.raises(ConfigError, match="サポートされていないプロバイダー"):
             self.config_manager.get_provider_config()
 
-    def test_validate_config_success(self, temp_config_file):
+    def test_validate_config_success(self):
         """設定検証成功テスト"""
-        with patch.object(self.config_manager.security_validator, 'check_file_permissions') as mock_check, \
-             patch.object(self.config_manager, 'get_api_key') as mock_get_key:
-
-            mock_check.return_value = type('Result', (), {'level': 'info'})()
+        with patch.object(self.config_manager, 'get_api_key') as mock_get_key:
             mock_get_key.return_value = 'valid-key'
 
-            self.config_manager.load_config(temp_config_file)
+            self._use_parsed_config()
             result = self.config_manager.validate_config()
 
             assert result is True
@@ -361,20 +385,22 @@ class TestConfigManager:
         providers['test'] = 'modified'
         assert 'test' not in self.config_manager.supported_providers
 
-    def test_str_representation(self, temp_config_file):
-        """文字列表現テスト（APIキーマスク）"""
-        with patch.object(self.config_manager.security_validator, 'check_file_permissions') as mock_check:
-            mock_check.return_value = type('Result', (), {'level': 'info'})()
+        # 入れ子の値を変更しても共有定義に影響しないことを確認
+        providers['openai']['required_fields'].append('extra')
+        assert 'extra' not in self.config_manager.get_supported_providers()['openai']['required_fields']
+        assert 'extra' not in ConfigManager().supported_providers['openai']['required_fields']
 
-            self.config_manager.load_config(temp_config_file)
-            str_repr = str(self.config_manager)
-
-            assert 'ConfigManager' in str_repr
-            assert 'openai' in str_repr
-            assert temp_config_file in str_repr
-            # APIキーがマスクされていることを確認
-            assert 'test-api-key' not in str_repr
-            assert '*' in str_repr
+    def test_str_representation(self):
+        """文字列表現テスト（APIキーマスク）"""
+        self._use_parsed_config()
+        str_repr = str(self.config_manager)
+
+        assert 'ConfigManager' in str_repr
+        assert 'openai' in str_repr
+        assert _FAKE_CONFIG_PATH in str_repr
+        # APIキーがマスクされていることを確認
+        assert 'test-api-key' not in str_repr
+        assert '*' in str_repr
 
     @pytest.mark.parametrize("provider,expected_type", [
         ('openai', 'api'),
@@ -1,19 +1,70 @@
 """
 Gemini Direct CLI プロバイダーのテスト
+
+CLIの呼び出しはすべてモック化されており、pytest-xdistで並列実行できる:
+    pytest -n auto --dist=loadgroup tests/test_gemini_direct_cli_provider.py
 """
 
+import copy
+
 import pytest
 import subprocess
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
-from pathlib import Path
 
 from lazygit_llm.cli_providers.gemini_direct_cli_provider import GeminiDirectCLIProvider
 from lazygit_llm.base_provider import ProviderError, AuthenticationError, ProviderTimeoutError, ResponseError
 
-
-@pytest.fixture
+# モジュールスコープのプロバイダーをワーカー間で重複構築しないよう、同じワーカーに集める
+pytestmark = pytest.mark.xdist_group("gemini_direct_cli")
+
+
+def _success(stdout=''):
+    """returncode=0で指定のstdoutを返したsubprocess.runの結果"""
+    return subprocess.CompletedProcess(args=[], returncode=0, stdout=stdout, stderr='')
+
+
+def _install_fake_run(monkeypatch, result=None, exc=None):
+    """
+    subprocess.runを呼び出し記録を持たない関数へ差し替える
+
+    呼び出し引数を検証しないテスト用。excを指定した場合は呼び出し時に送出する。
+    """
+    def fake_run(*args, **kwargs):
+        if exc is not None:
+            raise exc
+        return result
+
+    monkeypatch.setattr('subprocess.run', fake_run)
+
+
+# generate_commit_message の (subprocess.run の結果または例外を作る関数, 期待する例外, 期待値/メッセージ)
+# 例外インスタンスを共有すると__traceback__/__context__が前のテストから連鎖するため、関数で毎回生成する
+_GENERATE_CASES = [
+    pytest.param(_success("feat: add hello world message\n"), None, "feat: add hello world message", id="success"),
+    pytest.param(
+        _success("Commit message: feat: add hello world message\n"), None, "feat: add hello world message",
+        id="prefix_cleanup",
+    ),
+    pytest.param(
+        _success("```\nfeat: add hello world message\n```"), None, "feat: add hello world message",
+        id="markdown_cleanup",
+    ),
+    pytest.param(
+        lambda: subprocess.TimeoutExpired('gemini', 30), ProviderTimeoutError, None,
+        id="timeout",
+    ),
+    pytest.param(
+        lambda: subprocess.CalledProcessError(1, 'gemini', "Authentication failed"), AuthenticationError, None,
+        id="auth_error",
+    ),
+    pytest.param(_success(), ResponseError, "Geminiからの無効なレスポンス", id="empty_response"),
+]
+
+
+@pytest.fixture(scope="session")
 def sample_config():
-    """テスト用設定"""
+    """テスト用設定（読み取り専用。変更するテストはcopy.deepcopyしてから使う）"""
     return {
         'provider': 'gemini-cli',
         'model_name': 'gemini-1.5-pro',
@@ -26,7 +77,7 @@ def sample_config():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_git_diff():
     """テスト用Git差分"""
     return """--- a/src/main.py
@@ -38,22 +89,34 @@ def sample_git_diff():
 """
 
 
-class TestGeminiDirectCLIProvider:
-    """Gemini Direct CLI プロバイダーのテストクラス"""
+@pytest.fixture(scope="module")
+def provider(sample_config):
+    """sample_configで構築し、読み取り専用テストで共有するプロバイダー（モジュールで一度だけ構築）"""
+    with patch('shutil.which', return_value='/usr/local/bin/gemini'):
+        return GeminiDirectCLIProvider(sample_config)
 
-    def setup_method(self):
-        """各テストメソッドの前に実行"""
-        self.provider = None
 
-    def teardown_method(self):
-        """各テストメソッドの後に実行"""
-        self.provider = None
+@pytest.fixture(autouse=True)
+def gemini_mocks(monkeypatch):
+    """
+    shutil.whichとsubprocess.runを差し替え、各モックを公開する
+
+    テストでは gemini_mocks.which / gemini_mocks.run の return_value・side_effect を直接設定する。
+    """
+    mocks = SimpleNamespace(
+        which=Mock(return_value='/usr/local/bin/gemini'),
+        run=Mock(return_value=_success()),
+    )
+    monkeypatch.setattr('shutil.which', mocks.which)
+    monkeypatch.setattr('subprocess.run', mocks.run)
+    return mocks
 
-    @patch('shutil.which')
-    def test_init_success(self, mock_which, sample_config):
-        """初期化成功テスト"""
-        mock_which.return_value = '/usr/local/bin/gemini'
 
+class TestGeminiDirectCLIProvider:
+    """Gemini Direct CLI プロバイダーのテストクラス"""
+
+    def test_init_success(self, sample_config):
+        """初期化成功テスト"""
         provider = GeminiDirectCLIProvider(sample_config)
 
         assert provider.model == 'gemini-1.5-pro'
@@ -61,138 +124,49 @@ class TestGeminiDirectCLIProvider:
         assert provider.api_key == 'test-api-key'
         assert provider.gemini_path == '/usr/local/bin/gemini'
 
-    @patch('shutil.which')
-    def test_init_gemini_not_found(self, mock_which, sample_config):
+    def test_init_gemini_not_found(self, gemini_mocks, sample_config):
         """geminiコマンドが見つからない場合のテスト"""
-        mock_which.return_value = None
+        gemini_mocks.which.return_value = None
 
         with pytest.raises(ProviderError, match="geminiコマンドが見つかりません"):
             GeminiDirectCLIProvider(sample_config)
 
-    @patch('shutil.which')
-    def test_init_invalid_binary(self, mock_which, sample_config):
+    def test_init_invalid_binary(self, gemini_mocks, sample_config):
         """無効なバイナリの場合のテスト"""
-        mock_which.return_value = '/usr/bin/malicious'
+        gemini_mocks.which.return_value = '/usr/bin/malicious'
 
         with pytest.raises(ProviderError, match="許可されていないバイナリ"):
             GeminiDirectCLIProvider(sample_config)
 
-    @patch('shutil.which')
-    @patch('subprocess.run')
-    def test_generate_commit_message_success(self, mock_run, mock_which, sample_config, sample_git_diff):
-        """コミットメッセージ生成成功テスト"""
-        mock_which.return_value = '/usr/local/bin/gemini'
-        mock_run.return_value = Mock(
-            returncode=0,
-            stdout="feat: add hello world message\n",
-            stderr=""
-        )
-
-        provider = GeminiDirectCLIProvider(sample_config)
-        prompt_template = "Generate commit message: {diff}"
-
-        result = provider.generate_commit_message(sample_git_diff, prompt_template)
-
-        assert result == "feat: add hello world message"
-        mock_run.assert_called_once()
-
-    @patch('shutil.which')
-    @patch('subprocess.run')
-    def test_generate_commit_message_with_prefix_cleanup(self, mock_run, mock_which, sample_config, sample_git_diff):
-        """プレフィックス付きレスポンスのクリーンアップテスト"""
-        mock_which.return_value = '/usr/local/bin/gemini'
-        mock_run.return_value = Mock(
-            returncode=0,
-            stdout="Commit message: feat: add hello world message\n",
-            stderr=""
-        )
-
-        provider = GeminiDirectCLIProvider(sample_config)
-        prompt_template = "Generate commit message: {diff}"
-
-        result = provider.generate_commit_message(sample_git_diff, prompt_template)
-
-        assert result == "feat: add hello world message"
-
-    @patch('shutil.which')
-    @patch('subprocess.run')
-    def test_generate_commit_message_with_markdown_cleanup(self, mock_run, mock_which, sample_config, sample_git_diff):
-        """マークダウンコードブロックのクリーンアップテスト"""
-        mock_which.return_value = '/usr/local/bin/gemini'
-        mock_run.return_value = Mock(
-            returncode=0,
-            stdout="```\nfeat: add hello world message\n```",
-            stderr=""
-        )
-
-        provider = GeminiDirectCLIProvider(sample_config)
-        prompt_template = "Generate commit message: {diff}"
-
-        result = provider.generate_commit_message(sample_git_diff, prompt_template)
-
-        assert result == "feat: add hello world message"
-
-    @patch('shutil.which')
-    @patch('subprocess.run')
-    def test_generate_commit_message_timeout(self, mock_run, mock_which, sample_config, sample_git_diff):
-        """タイムアウトエラーテスト"""
-        mock_which.return_value = '/usr/local/bin/gemini'
-        mock_run.side_effect = subprocess.TimeoutExpired('gemini', 30)
-
-        provider = GeminiDirectCLIProvider(sample_config)
-        prompt_template = "Generate commit message: {diff}"
-
-        with pytest.raises(ProviderTimeoutError):
-            provider.generate_commit_message(sample_git_diff, prompt_template)
-
-    @patch('shutil.which')
-    @patch('subprocess.run')
-    def test_generate_commit_message_auth_error(self, mock_run, mock_which, sample_config, sample_git_diff):
-        """認証エラーテスト"""
-        mock_which.return_value = '/usr/local/bin/gemini'
-        mock_run.side_effect = subprocess.CalledProcessError(1, 'gemini', "Authentication failed")
+    @pytest.mark.parametrize("run_effect, expected_exc, expected", _GENERATE_CASES)
+    def test_generate_commit_message(self, gemini_mocks, sample_config, sample_git_diff,
+                                     run_effect, expected_exc, expected):
+        """コミットメッセージ生成テスト（成功・クリーンアップ・各種エラー）"""
+        if callable(run_effect):
+            gemini_mocks.run.side_effect = run_effect()
+        else:
+            gemini_mocks.run.return_value = run_effect
 
         provider = GeminiDirectCLIProvider(sample_config)
         prompt_template = "Generate commit message: {diff}"
 
-        with pytest.raises(AuthenticationError):
-            provider.generate_commit_message(sample_git_diff, prompt_template)
+        if expected_exc is None:
+            assert provider.generate_commit_message(sample_git_diff, prompt_template) == expected
+            gemini_mocks.run.assert_called_once()
+        else:
+            with pytest.raises(expected_exc, match=expected):
+                provider.generate_commit_message(sample_git_diff, prompt_template)
 
-    @patch('shutil.which')
-    @patch('subprocess.run')
-    def test_generate_commit_message_empty_response(self, mock_run, mock_which, sample_config, sample_git_diff):
-        """空のレスポンステスト"""
-        mock_which.return_value = '/usr/local/bin/gemini'
-        mock_run.return_value = Mock(
-            returncode=0,
-            stdout="",
-            stderr=""
-        )
-
-        provider = GeminiDirectCLIProvider(sample_config)
-        prompt_template = "Generate commit message: {diff}"
-
-        with pytest.raises(ResponseError, match="Geminiからの無効なレスポンス"):
-            provider.generate_commit_message(sample_git_diff, prompt_template)
-
-    @patch('shutil.which')
     @patch('tempfile.NamedTemporaryFile')
-    @patch('subprocess.run')
     @patch('os.unlink')
-    def test_execute_with_tempfile(self, mock_unlink, mock_run, mock_tempfile, mock_which, sample_config):
+    def test_execute_with_tempfile(self, mock_unlink, mock_tempfile, monkeypatch, sample_config):
         """大きなプロンプトのファイル経由実行テスト"""
-        mock_which.return_value = '/usr/local/bin/gemini'
-
         # 一時ファイルのモック
         mock_file = MagicMock()
         mock_file.name = '/tmp/test.txt'
         mock_tempfile.return_value.__enter__.return_value = mock_file
 
-        mock_run.return_value = Mock(
-            returncode=0,
-            stdout="feat: large prompt response\n",
-            stderr=""
-        )
+        _install_fake_run(monkeypatch, result=_success("feat: large prompt response\n"))
 
         provider = GeminiDirectCLIProvider(sample_config)
         large_prompt = "x" * 10000  # 8KBを超える大きなプロンプト
@@ -204,16 +178,9 @@ class TestGeminiDirectCLIProvider:
         mock_file.write.assert_called_once_with(large_prompt)
         mock_unlink.assert_called_once_with('/tmp/test.txt')
 
-    @patch('shutil.which')
-    @patch('subprocess.run')
-    def test_execute_with_args(self, mock_run, mock_which, sample_config):
+    def test_execute_with_args(self, gemini_mocks, sample_config):
         """小さなプロンプトのコマンド引数実行テスト"""
-        mock_which.return_value = '/usr/local/bin/gemini'
-        mock_run.return_value = Mock(
-            returncode=0,
-            stdout="feat: small prompt response\n",
-            stderr=""
-        )
+        gemini_mocks.run.return_value = _success("feat: small prompt response\n")
 
         provider = GeminiDirectCLIProvider(sample_config)
         small_prompt = "Generate commit message"
@@ -222,43 +189,29 @@ class TestGeminiDirectCLIProvider:
 
         assert result == "feat: small prompt response\n"
         # コマンド引数に --prompt または -p が含まれることを確認
-        call_args = mock_run.call_args[0][0]
+        call_args = gemini_mocks.run.call_args[0][0]
         assert ('--prompt' in call_args) or ('-p' in call_args)
         assert small_prompt in call_args
 
-    @patch('shutil.which')
-    @patch('subprocess.run')
-    def test_test_connection_success(self, mock_run, mock_which, sample_config):
+    def test_test_connection_success(self, monkeypatch, sample_config):
         """接続テスト成功"""
-        mock_which.return_value = '/usr/local/bin/gemini'
-        mock_run.return_value = Mock(
-            returncode=0,
-            stdout="OK\n",
-            stderr=""
-        )
+        _install_fake_run(monkeypatch, result=_success("OK\n"))
 
         provider = GeminiDirectCLIProvider(sample_config)
 
         assert provider.test_connection() is True
 
-    @patch('shutil.which')
-    @patch('subprocess.run')
-    def test_test_connection_timeout(self, mock_run, mock_which, sample_config):
+    def test_test_connection_timeout(self, monkeypatch, sample_config):
         """接続テストタイムアウト"""
-        mock_which.return_value = '/usr/local/bin/gemini'
-        mock_run.side_effect = subprocess.TimeoutExpired('gemini', 10)
+        _install_fake_run(monkeypatch, exc=subprocess.TimeoutExpired('gemini', 10))
 
         provider = GeminiDirectCLIProvider(sample_config)
 
         with pytest.raises(ProviderTimeoutError):
             provider.test_connection()
 
-    @patch('shutil.which')
-    def test_get_model_info(self, mock_which, sample_config):
+    def test_get_model_info(self, provider):
         """モデル情報取得テスト"""
-        mock_which.return_value = '/usr/local/bin/gemini'
-
-        provider = GeminiDirectCLIProvider(sample_config)
         info = provider.get_model_info()
 
         assert info['provider'] == 'gemini-cli'
@@ -266,67 +219,76 @@ class TestGeminiDirectCLIProvider:
         assert info['temperature'] == 0.3
         assert info['cli_path'] == '/usr/local/bin/gemini'
 
-    @patch('shutil.which')
-    def test_get_required_config_fields(self, mock_which, sample_config):
+    def test_get_required_config_fields(self, provider):
         """必須設定項目取得テスト"""
-        mock_which.return_value = '/usr/local/bin/gemini'
-
-        provider = GeminiDirectCLIProvider(sample_config)
         required_fields = provider.get_required_config_fields()
 
         assert required_fields == ['model_name']
 
-    @patch('shutil.which')
-    def test_validate_config_success(self, mock_which, sample_config):
+    def test_validate_config_success(self, provider):
         """設定検証成功テスト"""
-        mock_which.return_value = '/usr/local/bin/gemini'
-
-        provider = GeminiDirectCLIProvider(sample_config)
-
         assert provider.validate_config() is True
 
     def test_validate_config_invalid_model_name(self, sample_config):
         """無効なモデル名の設定検証テスト"""
+        sample_config = copy.deepcopy(sample_config)
         sample_config['model_name'] = ""
 
-        with patch('shutil.which', return_value='/usr/local/bin/gemini'):
-            provider = GeminiDirectCLIProvider(sample_config)
-            assert provider.validate_config() is False
+        provider = GeminiDirectCLIProvider(sample_config)
+        assert provider.validate_config() is False
 
     def test_validate_config_invalid_timeout(self, sample_config):
         """無効なタイムアウトの設定検証テスト"""
+        sample_config = copy.deepcopy(sample_config)
         sample_config['timeout'] = -1
 
-        with patch('shutil.which', return_value='/usr/local/bin/gemini'):
-            provider = GeminiDirectCLIProvider(sample_config)
-            assert provider.validate_config() is False
-
-    @patch('shutil.which')
-    def test_clean_response_various_formats(self, mock_which, sample_config):
-        """様々な形式のレスポンスクリーンアップテスト"""
-        mock_which.return_value = '/usr/local/bin/gemini'
         provider = GeminiDirectCLIProvider(sample_config)
+        assert provider.validate_config() is False
 
+    @pytest.mark.parametrize("raw,expected", [
         # 引用符付きレスポンス
-        assert provider._clean_response('"feat: add feature"') == "feat: add feature"
-        assert provider._clean_response("'feat: add feature'") == "feat: add feature"
-
+        ('"feat: add feature"', "feat: add feature"),
+        ("'feat: add feature'", "feat: add feature"),
         # プレフィックス付きレスポンス
-        assert provider._clean_response("Commit message: feat: add feature") == "feat: add feature"
-        assert provider._clean_response("Here's a commit message: feat: add feature") == "feat: add feature"
-
+        ("Commit message: feat: add feature", "feat: add feature"),
+        ("Here's a commit message: feat: add feature", "feat: add feature"),
         # 前後の空白
-        assert provider._clean_response("  feat: add feature  ") == "feat: add feature"
+        ("  feat: add feature  ", "feat: add feature"),
+    ])
+    def test_clean_response_various_formats(self, provider, raw, expected):
+        """様々な形式のレスポンスクリーンアップテスト"""
+        assert provider._clean_response(raw) == expected
 
-    def test_response_validation(self, sample_config):
+    def test_response_validation(self, provider):
         """レスポンス検証テスト"""
-        with patch('shutil.which', return_value='/usr/local/bin/gemini'):
-            provider = GeminiDirectCLIProvider(sample_config)
-
-            # 有効なレスポンス
-            assert provider._validate_response("feat: add feature") is True
-
-            # 無効なレスポンス
-            assert provider._validate_response("") is False
-            assert provider._validate_response("   ") is False
-            assert provider._validate_response("x" * (provider.MAX_STDOUT_SIZE + 1)) is False
+        # 有効なレスポンス
+        assert provider._validate_response("feat: add feature") is True
+
+        # 無効なレスポンス
+        assert provider._validate_response("") is False
+        assert provider._validate_response("   ") is False
+        assert provider._validate_response("x" * (provider.MAX_STDOUT_SIZE + 1)) is False
+
+    @pytest.mark.parametrize("stderr,returncode,expected", [
+        ("Error: Quota exceeded for quota metric", 1, 'quota'),
+        ("HTTP 429 Too Many Requests", 1, 'quota'),
+        ("Rate limit reached", 1, 'quota'),
+        ("401 Unauthorized", 1, 'auth'),
+        ("(403) Forbidden", 1, 'auth'),
+        ("Authentication failed", 1, 'auth'),
+        ("Invalid API key", 1, 'auth'),
+        ("Network error", 1, 'network'),
+        ("Connection refused", 1, 'network'),
+        ("Request timed out", 1, 'timeout'),
+        # 複数の種別に該当する場合は優先度の高い種別を返す
+        ("Rate limit reached: authentication pending", 1, 'quota'),
+        # ステータスコードは単独のトークンのみを対象とする
+        ("Processed 4290 bytes", 1, None),
+        ("Unknown failure", 1, None),
+        ("", 1, None),
+        # 成功時は判定しない
+        ("429 Too Many Requests", 0, None),
+    ])
+    def test_classify_stderr(self, provider, stderr, returncode, expected):
+        """stderrからのエラー種別判定テスト"""
+        assert provider._classify_stderr(stderr, returncode) == expected